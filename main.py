@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+import asyncio
 from datetime import datetime
 from dotenv import load_dotenv
 from src.monitor import NintendoMuseumMonitor
@@ -18,6 +19,8 @@ def main():
     """Main entry point for Nintendo Museum Monitor"""
     # Get monitor interval from .env (default: 20 seconds)
     monitor_interval = int(os.getenv('MONITOR_INTERVAL', '20'))
+    # Number of consecutive months to watch, starting with the current one (default: 1)
+    monitor_months = int(os.getenv('MONITOR_MONTHS', '1'))
 
     # Get current date
     now = datetime.now()
@@ -27,15 +30,19 @@ def main():
     logger.info("="*50)
     logger.info("Nintendo Museum Ticket Monitor")
     logger.info("="*50)
-    logger.info(f"Monitoring: {year}-{month:02d}")
-    logger.info(f"Interval: {monitor_interval} seconds")
+    logger.info("Monitoring: %d-%02d", year, month)
+    logger.info("Months: %d", monitor_months)
+    logger.info("Interval: %d seconds", monitor_interval)
     logger.info("="*50)
 
     # Create monitor instance
     monitor = NintendoMuseumMonitor()
 
     # Start monitoring
-    monitor.monitor(year, month, interval=monitor_interval)
+    try:
+        asyncio.run(monitor.monitor(year, month, interval=monitor_interval, months=monitor_months))
+    except KeyboardInterrupt:
+        logger.info("Monitor stopped by user")
 
 
 if __name__ == "__main__":
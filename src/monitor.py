@@ -1,16 +1,20 @@
 import os
 import sys
 import time
+import asyncio
+import itertools
 import random
-from datetime import datetime
-from typing import Dict, Any
-from curl_cffi import requests
+from datetime import date, datetime
+from typing import Dict, Any, List
+import orjson
+from curl_cffi.requests import AsyncSession
+from discord_webhook import DiscordWebhook, DiscordEmbed
 from dotenv import load_dotenv
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.discord_utils import ImmoweltDiscordWebhook
-from utils.load_proxies import proxies as loaded_proxies
+from utils.load_proxies import get_proxies
 from utils.logging_setter import setup_logger
 
 load_dotenv()
@@ -20,67 +24,132 @@ logger = setup_logger('nintendo_monitor', 'nintendo_monitor.log')
 class NintendoMuseumMonitor:
     """Monitor for Nintendo Museum ticket availability"""
 
+    # Discord accepts at most 10 embeds per webhook message
+    MAX_EMBEDS_PER_MESSAGE = 10
+
+    # Upper bound (seconds) for the backoff after failed polls
+    MAX_BACKOFF = 600
+
+    BASE_URL = "https://museum-tickets.nintendo.com"
+
+    # Browser headers sent with every calendar request
+    _STATIC_HEADERS = {
+        'Connection': 'keep-alive',
+        'sec-ch-ua-platform': '"macOS"',
+        'X-Requested-With': 'XMLHttpRequest',
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36',
+        'Accept': 'application/json, text/plain, */*',
+        'sec-ch-ua': '"Google Chrome";v="141", "Not?A_Brand";v="8", "Chromium";v="141"',
+        'sec-ch-ua-mobile': '?0',
+        'Sec-Fetch-Site': 'same-origin',
+        'Sec-Fetch-Mode': 'cors',
+        'Sec-Fetch-Dest': 'empty',
+        'Referer': f'{BASE_URL}/en/calendar',
+        'Accept-Encoding': 'gzip, deflate, br, zstd',
+        'Accept-Language': 'de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7'
+    }
+
     def __init__(self):
-        self.base_url = "https://museum-tickets.nintendo.com"
+        self.base_url = self.BASE_URL
         self.api_url = f"{self.base_url}/en/api/calendar"
         self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
         self.discord_webhook = NintendoMuseumDiscordWebhook(self.webhook_url)
         self.notified_dates = set()
-
-    def get_random_proxy(self):
-        """Get a random proxy from the loaded proxies"""
-        if loaded_proxies and len(loaded_proxies) > 0 and loaded_proxies[0]:
-            proxy = random.choice(loaded_proxies)
-            logger.info(f"Using proxy: {proxy}")
-            return proxy
+        # Static parts of a notification; only the date is filled in per embed
+        self._notification_template = {
+            'url': f'{self.base_url}/en/calendar',
+            'title': 'Nintendo Museum Tickets Available!',
+            'description': '',
+            'thumbnail': f'{self.base_url}/images/logo.svg',
+            'fields': [
+                {
+                    'name': 'Date',
+                    'value': '',
+                    'inline': True
+                },
+                {
+                    'name': 'Status',
+                    'value': 'Available',
+                    'inline': True
+                },
+                {
+                    'name': 'Link',
+                    'value': f'[Book now]({self.base_url}/en/calendar)',
+                    'inline': False
+                }
+            ]
+        }
+        # Rotate through the proxies in order instead of picking one at random
+        loaded_proxies = get_proxies()
+        if loaded_proxies and loaded_proxies[0]:
+            self._proxy_iter = itertools.cycle(loaded_proxies)
         else:
+            self._proxy_iter = None
             logger.info("No proxies available, using direct connection")
+        # Last calendar body per 'YYYY-MM', revalidated with ETag/Last-Modified
+        # on every poll and returned again on 304 Not Modified
+        self._calendar_cache = {}
+        self._conditional_headers = {}
+        # Current delay after failed polls, doubled per failure and reset on success
+        self._backoff = 20
+        # Single persistent HTTP/2 session so polls multiplex over one pooled
+        # TCP/TLS connection; static headers are session defaults
+        self.session = AsyncSession(
+            impersonate="chrome110",
+            http_version="v2",
+            max_clients=10,
+            headers=self._STATIC_HEADERS
+        )
+        # Reused webhook object and persistent session for Discord notifications
+        self._webhook = DiscordWebhook(url=self.webhook_url) if self.webhook_url else None
+        self._webhook_session = AsyncSession(timeout=30)
+
+    def get_next_proxy(self):
+        """Get the next proxy from the loaded proxies (round-robin)"""
+        if self._proxy_iter is None:
             return None
+        proxy = next(self._proxy_iter)
+        logger.debug("Using proxy: %s", proxy)
+        return proxy
 
-    def fetch_calendar(self, year: int, month: int) -> Dict[str, Any]:
+    async def fetch_calendar(self, year: int, month: int) -> Dict[str, Any]:
         """Fetch calendar data for a specific month"""
-        proxy = self.get_random_proxy()
-
-        headers = {
-            'Connection': 'keep-alive',
-            'sec-ch-ua-platform': '"macOS"',
-            'X-Requested-With': 'XMLHttpRequest',
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'sec-ch-ua': '"Google Chrome";v="141", "Not?A_Brand";v="8", "Chromium";v="141"',
-            'sec-ch-ua-mobile': '?0',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Dest': 'empty',
-            'Referer': f'{self.base_url}/en/calendar',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Accept-Language': 'de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7'
-        }
+        key = f"{year}-{month:02d}"
+        cached = self._calendar_cache.get(key)
 
-        params = {
-            'target_year': year,
-            'target_month': month
-        }
+        proxy = self.get_next_proxy()
 
         try:
-            response = requests.get(
+            response = await self.session.get(
                 self.api_url,
-                params=params,
-                headers=headers,
+                params={'target_year': year, 'target_month': month},
+                headers=self._conditional_headers.get(key) if cached is not None else None,
                 proxies=proxy,
-                impersonate="chrome110",
                 timeout=30
             )
 
-            if response.status_code == 200:
-                logger.info(f"Successfully fetched calendar for {year}-{month:02d}")
-                return response.json()
+            if response.status_code == 304 and cached is not None:
+                logger.info("Calendar for %s not modified (from-cache: 1)", key)
+                return cached
+            elif response.status_code == 200:
+                logger.info("Successfully fetched calendar for %s", key)
+                calendar_data = orjson.loads(response.content)
+                self._calendar_cache[key] = calendar_data
+                self._conditional_headers[key] = {
+                    name: value
+                    for name, value in (
+                        ('If-None-Match', response.headers.get('ETag')),
+                        ('If-Modified-Since', response.headers.get('Last-Modified'))
+                    )
+                    if value
+                }
+                return calendar_data
             else:
-                logger.error(f"Failed to fetch calendar: {response.status_code}")
+                logger.error("Failed to fetch calendar: %s", response.status_code)
                 return None
 
         except Exception as e:
-            logger.error(f"Error fetching calendar: {str(e)}")
+            logger.error("Error fetching calendar: %s", e)
             return None
 
     def check_availability(self, calendar_data: Dict[str, Any]) -> list:
@@ -93,132 +162,161 @@ class NintendoMuseumMonitor:
         today = datetime.now().date()
 
         for date_str, info in calendar.items():
-            sale_status = info.get('sale_status')
-            open_status = info.get('open_status')
+            # Most dates are sold out or closed, so test the statuses first
+            if info.get('sale_status') != 1 or info.get('open_status') != 1:
+                continue
+
+            # Already notified dates need no further work
+            if date_str in self.notified_dates:
+                continue
 
-            # Parse date
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+            # Only future dates; fromisoformat is C-implemented, unlike strptime
+            if date.fromisoformat(date_str) <= today:
+                continue
 
-            # Only notify if: tickets available AND museum is open AND date is in future
-            if sale_status == 1 and open_status == 1 and date_obj > today and date_str not in self.notified_dates:
-                available_dates.append({
-                    'date': date_str,
-                    'info': info
-                })
-                logger.info(f"Found available date: {date_str} (sale_status={sale_status}, open_status={open_status})")
+            available_dates.append({
+                'date': date_str,
+                'info': info
+            })
+            logger.debug("Found available date: %s (sale_status=1, open_status=1)", date_str)
 
         return available_dates
 
-    def send_notification(self, available_dates: list):
-        """Send Discord notification for available dates"""
+    async def send_notification(self, available_dates: list):
+        """Send Discord notifications for available dates, batched into as few messages as possible"""
         if not available_dates:
             return
 
-        for date_info in available_dates:
-            date = date_info['date']
-            info = date_info['info']
-
-            notification_data = {
-                'url': f'{self.base_url}/en/calendar',
-                'title': f'Nintendo Museum Tickets Available!',
-                'description': f'Tickets are available for: **{date}**',
-                'thumbnail': f'{self.base_url}/images/logo.svg',
-                'fields': [
-                    {
-                        'name': 'Date',
-                        'value': date,
-                        'inline': True
-                    },
-                    {
-                        'name': 'Status',
-                        'value': 'Available',
-                        'inline': True
-                    },
-                    {
-                        'name': 'Link',
-                        'value': f'[Book now]({self.base_url}/en/calendar)',
-                        'inline': False
-                    }
-                ]
-            }
-
-            if self.send_custom_webhook(notification_data):
-                self.notified_dates.add(date)
-                logger.info(f"Notification sent for {date}")
-            else:
-                logger.error(f"Failed to send notification for {date}")
+        for start in range(0, len(available_dates), self.MAX_EMBEDS_PER_MESSAGE):
+            dates = [date_info['date'] for date_info in available_dates[start:start + self.MAX_EMBEDS_PER_MESSAGE]]
 
-    def send_custom_webhook(self, data: Dict[str, Any]) -> bool:
-        """Send custom Discord webhook"""
-        from discord_webhook import DiscordWebhook, DiscordEmbed
+            if await self.send_custom_webhook([self.build_notification_data(date) for date in dates]):
+                self.notified_dates.update(dates)
+                logger.info("Notification sent for %s", ', '.join(dates))
+            else:
+                logger.error("Failed to send notification for %s", ', '.join(dates))
+
+    def build_notification_data(self, date: str) -> Dict[str, Any]:
+        """Build the embed data for a single available date from the prebuilt template"""
+        template = self._notification_template
+        return {
+            **template,
+            'description': f'Tickets are available for: **{date}**',
+            'fields': [{**template['fields'][0], 'value': date}, *template['fields'][1:]]
+        }
 
+    async def send_custom_webhook(self, data_list: List[Dict[str, Any]]) -> bool:
+        """Send custom Discord webhook with one embed per entry (at most MAX_EMBEDS_PER_MESSAGE)"""
         if not self.webhook_url:
             logger.error("Discord webhook URL not configured")
             return False
 
         try:
-            webhook = DiscordWebhook(url=self.webhook_url)
+            webhook = self._webhook
+            webhook.remove_embeds()
+
+            for data in data_list[:self.MAX_EMBEDS_PER_MESSAGE]:
+                embed = DiscordEmbed(
+                    title=data.get('title', 'Nintendo Museum Update')[:256],
+                    description=data.get('description', '')[:4096],
+                    color='03b2f8'
+                )
 
-            embed = DiscordEmbed(
-                title=data.get('title', 'Nintendo Museum Update')[:256],
-                description=data.get('description', '')[:4096],
-                color='03b2f8'
-            )
+                if data.get('url'):
+                    embed.set_url(data['url'])
 
-            if data.get('url'):
-                embed.set_url(data['url'])
+                if data.get('thumbnail'):
+                    embed.set_thumbnail(url=data['thumbnail'])
 
-            if data.get('thumbnail'):
-                embed.set_thumbnail(url=data['thumbnail'])
+                for field in data.get('fields', []):
+                    embed.add_embed_field(
+                        name=field['name'],
+                        value=field['value'],
+                        inline=field.get('inline', False)
+                    )
 
-            for field in data.get('fields', []):
-                embed.add_embed_field(
-                    name=field['name'],
-                    value=field['value'],
-                    inline=field.get('inline', False)
-                )
+                embed.set_footer(text="Nintendo Museum Monitor", icon_url=data.get('thumbnail', ''))
+                embed.set_timestamp()
 
-            embed.set_footer(text="Nintendo Museum Monitor", icon_url=data.get('thumbnail', ''))
-            embed.set_timestamp()
+                webhook.add_embed(embed)
 
-            webhook.add_embed(embed)
-            response = webhook.execute()
+            # discord-webhook only builds the payload; it is posted over the
+            # shared session so the connection to Discord stays open
+            response = await self._webhook_session.post(
+                self.webhook_url,
+                data=orjson.dumps(webhook.json),
+                headers={'Content-Type': 'application/json'}
+            )
 
             return response.status_code in [200, 204]
 
         except Exception as e:
-            logger.error(f"Error sending webhook: {str(e)}")
+            logger.error("Error sending webhook: %s", e)
             return False
 
-    def monitor(self, year: int, month: int, interval: int = 20):
+    def prune_notified_dates(self):
+        """Forget notified dates that are no longer in the future and so can never match again"""
+        # ISO dates compare correctly as strings, so no parsing is needed
+        today = date.today().isoformat()
+        self.notified_dates = {d for d in self.notified_dates if d > today}
+
+    @staticmethod
+    def get_target_months(year: int, month: int, months: int = 1) -> list:
+        """Get (year, month) tuples for `months` consecutive months starting at year-month"""
+        return [
+            (year + (month - 1 + offset) // 12, (month - 1 + offset) % 12 + 1)
+            for offset in range(max(1, months))
+        ]
+
+    def get_next_delay(self, interval: int, success: bool) -> float:
+        """Get the sleep before the next poll with +/-10% jitter, backing off exponentially after failures"""
+        if success:
+            self._backoff = interval
+        else:
+            self._backoff = min(self._backoff * 2, max(self.MAX_BACKOFF, interval))
+        return self._backoff * random.uniform(0.9, 1.1)
+
+    async def monitor(self, year: int, month: int, interval: int = 20, months: int = 1):
         """Monitor calendar continuously"""
-        logger.info(f"Starting Nintendo Museum Monitor for {year}-{month:02d}")
-        logger.info(f"Checking every {interval} seconds")
+        targets = self.get_target_months(year, month, months)
+        target_names = ", ".join(f"{y}-{m:02d}" for y, m in targets)
+        logger.info("Starting Nintendo Museum Monitor for %s", target_names)
+        logger.info("Checking every %s seconds", interval)
+        self._backoff = interval
 
-        while True:
-            try:
-                logger.info(f"Checking availability at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        try:
+            while True:
+                try:
+                    self.prune_notified_dates()
+                    logger.info("Checking availability at %s", datetime.now())
 
-                calendar_data = self.fetch_calendar(year, month)
+                    # Fetch all watched months concurrently over the shared session
+                    results = await asyncio.gather(
+                        *(self.fetch_calendar(y, m) for y, m in targets)
+                    )
 
-                if calendar_data:
-                    available_dates = self.check_availability(calendar_data)
+                    available_dates = []
+                    for calendar_data in results:
+                        if calendar_data:
+                            available_dates.extend(self.check_availability(calendar_data))
 
                     if available_dates:
-                        logger.info(f"Found {len(available_dates)} available dates")
-                        self.send_notification(available_dates)
+                        logger.info("Found %d available dates", len(available_dates))
+                        await self.send_notification(available_dates)
                     else:
                         logger.info("No new available dates found")
 
-                logger.info(f"Waiting {interval} seconds before next check...")
-                time.sleep(interval)
+                    delay = self.get_next_delay(interval, success=all(r is not None for r in results))
+                    logger.debug("Waiting %.1f seconds before next check...", delay)
+                    await asyncio.sleep(delay)
 
-            except KeyboardInterrupt:
-                logger.info("Monitor stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"Error in monitor loop: {str(e)}")
-                time.sleep(interval)
+                except Exception as e:
+                    delay = self.get_next_delay(interval, success=False)
+                    logger.error("Error in monitor loop: %s, retrying in %.1f seconds", e, delay)
+                    await asyncio.sleep(delay)
+        finally:
+            await self.session.close()
+            await self._webhook_session.close()
 
 
 class NintendoMuseumDiscordWebhook:
@@ -238,7 +336,10 @@ def main():
 
     monitor = NintendoMuseumMonitor()
 
-    monitor.monitor(year, month, interval=20)
+    try:
+        asyncio.run(monitor.monitor(year, month, interval=20))
+    except KeyboardInterrupt:
+        logger.info("Monitor stopped by user")
 
 
 if __name__ == '__main__':
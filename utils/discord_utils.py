@@ -2,19 +2,152 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
+import time
+import asyncio
 import logging
+import functools
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
-from discord_webhook import DiscordWebhook, DiscordEmbed
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from curl_cffi.requests import AsyncSession
+from dotenv import load_dotenv
 from utils.logging_setter import setup_logger
-# Setup logger
-logger = setup_logger('discord_webhook', 'discord_webhook.log')
+
+# .env must be loaded before the class body reads the default webhook URL
+load_dotenv()
+
+# Logger handlers (and the log file) are only set up once a webhook is created
+logger = logging.getLogger('discord_webhook')
+_configured = False
+
+
+def _ensure_logger() -> None:
+    """Attaches the file and console handlers to the module logger on first use."""
+    global _configured
+    if not _configured:
+        setup_logger('discord_webhook', 'discord_webhook.log')
+        _configured = True
+
+
+# Shared embed constants, reused by every payload
+EMBED_COLOR = 0x03b2f8  # Blue
+FOOTER = {"text": "by Aimani.de", "icon_url": "https://aimani.de/logo.png"}
+
+# Payloads are posted as orjson-encoded bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# German thousands separator: 589900 -> "589.900"
+_THOUSANDS_TABLE = str.maketrans(",", ".")
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_thousands(value: int) -> str:
+    """Formats an integer with "." as thousands separator (cached, prices repeat)."""
+    return format(value, ",").translate(_THOUSANDS_TABLE)
+
+
+# Unit suffix per area type in the mobile API "areas" array
+_AREA_UNITS = {"LIVING_AREA": "m²", "PLOT_AREA": "m² plot"}
+
+
+def _range_str(size_min: Any, size_max: Any, unit: str) -> str:
+    """Formats a min/max pair as "min-max unit", or "min unit" if there is no real range."""
+    if size_max and size_max != size_min:
+        return f"{size_min}-{size_max} {unit}"
+    return f"{size_min} {unit}"
+
+
+def _is_http(url: Any) -> bool:
+    """Returns True if url is an absolute http(s) URL."""
+    return isinstance(url, str) and url.startswith(("http://", "https://"))
+
+
+def _normalize_url(url: Any) -> Optional[str]:
+    """Returns url as an absolute http(s) URL (protocol-relative URLs get https:), otherwise None."""
+    if isinstance(url, str) and url.startswith("//"):
+        url = "https:" + url
+    return url if _is_http(url) else None
+
+
+def _utcnow_iso() -> str:
+    """Returns the current UTC time as an ISO 8601 string for embed timestamps."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _safe_get(data: Any, *path: Any, default: Any = None) -> Any:
+    """Follows a path of keys/indices into nested data, returning default if any step is missing."""
+    try:
+        for key in path:
+            data = data[key]
+        return data
+    except (KeyError, IndexError, TypeError):
+        return default
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    """Returns value if it is a dict, otherwise an empty dict."""
+    return value if isinstance(value, dict) else {}
+
+
+def _as_list(value: Any) -> List[Any]:
+    """Returns value if it is a list, otherwise an empty list."""
+    return value if isinstance(value, list) else []
+
+
+class _PropertyContext:
+    """
+    Top-level sections of a property listing, looked up once per listing
+    and shared by all extractors. Missing or malformed sections are empty.
+    """
+
+    __slots__ = (
+        "data", "broker", "provider", "intermediary_card", "hard_facts", "facts_by_type",
+        "raw_data", "surface", "place", "areas_by_type", "primary_price", "primary_area",
+    )
+
+    def __init__(self, property_data: Dict[str, Any]):
+        self.data = property_data
+        self.broker = _as_dict(property_data.get("broker"))
+        self.provider = _as_dict(property_data.get("provider"))
+        self.intermediary_card = _as_dict(self.provider.get("intermediaryCard"))
+        self.hard_facts = _as_dict(property_data.get("hardFacts"))
+        self.raw_data = _as_dict(property_data.get("rawData"))
+        self.surface = _as_dict(self.raw_data.get("surface"))
+        self.place = _as_dict(property_data.get("place"))
+        self.primary_price = _as_dict(property_data.get("primaryPrice"))
+        self.primary_area = _as_dict(property_data.get("primaryArea"))
+
+        # Index facts and areas by type once so extractors do a single lookup
+        # instead of scanning the lists; the first match wins, as before
+        self.facts_by_type = {}
+        for fact in _as_list(self.hard_facts.get("facts")):
+            if isinstance(fact, dict):
+                self.facts_by_type.setdefault(fact.get("type"), fact.get("value", ""))
+
+        # Only areas with a size are usable
+        self.areas_by_type = {}
+        for area in _as_list(property_data.get("areas")):
+            if isinstance(area, dict) and area.get("sizeMin") is not None:
+                self.areas_by_type.setdefault(area.get("type"), area)
+
 
 class ImmoweltDiscordWebhook:
     """
     Class for sending property details to a Discord webhook
-    using the external discord-webhook library.
+    by posting the embed JSON directly.
     """
 
+    # Concurrent senders for bulk sends; Discord allows about 5 requests per webhook every 2 seconds
+    MAX_WORKERS = 5
+
+    # Fallback webhook URL, read from the environment once
+    _default_url = os.environ.get('DISCORD_WEBHOOK_URL')
+
     def __init__(self, webhook_url: str = None):
         """
         Initializes the Discord webhook with the provided URL.
@@ -23,10 +156,40 @@ class ImmoweltDiscordWebhook:
             webhook_url (str, optional): Discord webhook URL.
                 If not provided, attempts to load from environment variable.
         """
-        self.webhook_url = webhook_url or os.getenv('DISCORD_WEBHOOK_URL')
+        _ensure_logger()
+        self.webhook_url = webhook_url or self._default_url
 
         if not self.webhook_url:
             logger.warning("No Discord webhook URL provided or found in environment variables.")
+
+        # Discord's rate limit bucket for the webhook: requests left (None if
+        # unknown), monotonic reset time, and requests not yet answered
+        self._bucket_remaining = None
+        self._bucket_reset_at = 0.0
+        self._in_flight = 0
+
+        # Static part of every embed, bound once; per listing only the
+        # variable fields are added on top
+        self._embed_skeleton = {"color": EMBED_COLOR, "footer": FOOTER}
+
+        # Persistent session so successive sends reuse the keep-alive connection
+        # to Discord. The POST is only retried when Discord cannot have accepted
+        # it (connect errors, 429 with Retry-After), so a listing is never
+        # posted twice after a read timeout or 5xx
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                read=0,
+                other=0,
+                backoff_factor=0.3,
+                status_forcelist=[429],
+                allowed_methods=["POST"]
+            )
+        )
+        self._session.mount("https://", adapter)
     
     def send_property(self, property_data: Dict[str, Any]) -> bool:
         """
@@ -43,138 +206,157 @@ class ImmoweltDiscordWebhook:
             return False
 
         try:
-            # Extract property data
-            url = property_data.get("url", "")
-            title = self._extract_title(property_data)
-            address = self._extract_address(property_data)
-            price = self._extract_price(property_data)
+            payload = self._build_payload(property_data)
+            if payload is None:
+                logger.info("Skipping empty listing")
+                return False
+            embed = payload["embeds"][0]
+
+            # Debug: Log embed data (skip building the messages unless DEBUG is on)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Embed Title: {embed.get('title')}")
+                logger.debug(f"Embed Description: {embed.get('description')}")
+                logger.debug(f"Embed URL: {embed.get('url')}")
+                logger.debug(f"Embed Fields: {len(embed.get('fields') or [])}")
+
+            # Send webhook over the pooled keep-alive session
+            response = self._session.post(
+                self.webhook_url, data=orjson.dumps(payload), headers=JSON_HEADERS, timeout=(3, 10)
+            )
 
-            # Extract additional provider information
-            provider_info = self._extract_provider_info(property_data)
+            # Check if webhook was executed successfully
+            if response.status_code in [200, 204]:
+                logger.info(f"Property listing successfully sent to Discord: {embed.get('title')}")
+                return True
+            else:
+                logger.error(f"Error sending to Discord: {response.status_code} - {response.text}")
+                logger.error(f"Embed details - Title: {embed.get('title')}, URL: {embed.get('url')}")
+                return False
 
-            # Determine image source (if available)
-            image_url = self._extract_image_url(property_data)
-            logo_url = self._extract_logo_url(property_data)
+        except Exception as e:
+            logger.error(f"Error sending property listing to Discord: {str(e)}")
+            return False
 
+    def _build_embed(self, property_data: Dict[str, Any], timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Builds the Discord embed for a property listing as a plain dict
+        following Discord's embed schema.
 
-            # Create Discord webhook object
-            webhook = DiscordWebhook(url=self.webhook_url)
+        Args:
+            property_data (Dict[str, Any]): Property data with at least URL, title, and address
+            timestamp (str, optional): ISO timestamp for the embed, shared across a batch.
+                Defaults to the current time.
 
-            # Create embed object for webhook
-            # Discord title limit is 256 characters
-            embed_title = (title or "Property Listing")[:256]
-            # Discord description limit is 4096 characters
-            embed_description = (address or "")[:4096]
+        Returns:
+            Optional[Dict[str, Any]]: The embed describing the listing, or None if the
+                listing has no URL or nothing to show
+        """
+        # Look up the shared listing sections once for all extractors
+        ctx = _PropertyContext(property_data)
 
-            embed = DiscordEmbed(
-                title=embed_title,
-                description=embed_description,
-                color="03b2f8"  # Blue
-            )
+        # Extract property data
+        url = property_data.get("url", "")
+        title = self._extract_title(ctx)
+        address = self._extract_address(ctx)
+        price = self._extract_price(ctx)
 
-            # Set property listing URL
-            if url and url.startswith("http"):
-                embed.set_url(url)
+        # Malformed listing: not worth a request to Discord
+        if not (_is_http(url) and (price or address or (title and title != "Property Listing"))):
+            return None
 
-            # Add image if available
-            #if image_url:
-            #    embed.set_image(url=image_url)
+        # Extract additional provider information
+        provider_info = self._extract_provider_info(ctx)
+
+        # Determine image source (if available)
+        image_url = _normalize_url(self._extract_image_url(ctx))
+        logo_url = self._extract_logo_url(ctx)
+
+        # Create embed for webhook
+        # Discord title limit is 256 characters
+        # Discord description limit is 4096 characters
+        embed = {
+            **self._embed_skeleton,
+            "title": (title or "Property Listing")[:256],
+            "description": (address or "")[:4096],
+            "timestamp": timestamp or _utcnow_iso(),
+        }
 
-            # Add logo as thumbnail if available
-            if logo_url and logo_url.startswith("http"):
-                embed.set_thumbnail(url=logo_url)
-            elif image_url and image_url.startswith("http"):
-                embed.set_thumbnail(url=image_url)
+        # Set property listing URL (checked above)
+        embed["url"] = url
 
-            # Set footer
-            embed.set_footer(text="by Aimani.de", icon_url="https://aimani.de/logo.png")
+        # Add image if available
+        #if image_url:
+        #    embed["image"] = {"url": image_url}
 
-            # Set timestamp
-            embed.set_timestamp()
+        # Add logo as thumbnail if available
+        thumbnail_url = logo_url or image_url
+        if thumbnail_url:
+            embed["thumbnail"] = {"url": thumbnail_url}
 
-            # Add provider information as field
-            # Discord field value limit is 1024 characters
-            if provider_info:
-                embed.add_embed_field(name="Provider", value=provider_info[:1024], inline=False)
+        # Add provider information, price and additional details as fields
+        # Discord field value limit is 1024 characters
+        fields = []
+        if provider_info:
+            fields.append({"name": "Provider", "value": provider_info[:1024], "inline": False})
 
-            # Add price as field
-            if price:
-                embed.add_embed_field(name="Price", value=price[:1024])
+        if price:
+            fields.append({"name": "Price", "value": price[:1024], "inline": True})
 
-            # Add additional details as fields
-            room_info = self._extract_room_info(property_data)
-            if room_info:
-                embed.add_embed_field(name="Rooms", value=room_info[:1024])
+        room_info = self._extract_room_info(ctx)
+        if room_info:
+            fields.append({"name": "Rooms", "value": room_info[:1024], "inline": True})
 
-            area_info = self._extract_area_info(property_data)
-            if area_info:
-                embed.add_embed_field(name="Living Area", value=area_info[:1024])
+        area_info = self._extract_area_info(ctx)
+        if area_info:
+            fields.append({"name": "Living Area", "value": area_info[:1024], "inline": True})
 
-            plot_info = self._extract_plot_info(property_data)
-            if plot_info:
-                embed.add_embed_field(name="Plot", value=plot_info[:1024])
+        plot_info = self._extract_plot_info(ctx)
+        if plot_info:
+            fields.append({"name": "Plot", "value": plot_info[:1024], "inline": True})
 
-            # Add embed object to webhook
-            webhook.add_embed(embed)
+        embed["fields"] = fields
+        return embed
 
-            # Debug: Log embed data
-            logger.debug(f"Embed Title: {embed.title}")
-            logger.debug(f"Embed Description: {embed.description}")
-            logger.debug(f"Embed URL: {embed.url}")
-            logger.debug(f"Embed Fields: {len(embed.fields) if hasattr(embed, 'fields') else 'No fields'}")
+    def _build_payload(self, property_data: Dict[str, Any], timestamp: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Builds the webhook JSON body for a property listing.
 
-            # Send webhook
-            response = webhook.execute()
+        Args:
+            property_data (Dict[str, Any]): Property data with at least URL, title, and address
+            timestamp (str, optional): ISO timestamp for the embed, shared across a batch
 
-            # Check if webhook was executed successfully
-            if response.status_code in [200, 204]:
-                logger.info(f"Property listing successfully sent to Discord: {title}")
-                return True
-            else:
-                logger.error(f"Error sending to Discord: {response.status_code} - {response.text}")
-                logger.error(f"Embed details - Title: {embed.title}, URL: {embed.url}")
-                return False
+        Returns:
+            Optional[Dict[str, Any]]: Webhook JSON body containing the listing embed,
+                or None if the listing is empty
+        """
+        embed = self._build_embed(property_data, timestamp)
+        return {"embeds": [embed]} if embed else None
 
-        except Exception as e:
-            logger.error(f"Error sending property listing to Discord: {str(e)}")
-            return False
-    
-    def _extract_title(self, property_data: Dict[str, Any]) -> str:
+    def _extract_title(self, ctx: "_PropertyContext") -> str:
         """Extracts title from property data (supports old and new API formats)."""
         # New Mobile API Format
-        mobile_title = property_data.get("title")
+        mobile_title = ctx.data.get("title")
         if mobile_title:
             # Extend with Broker Company Name if available
-            broker = property_data.get("broker", {})
-            company_name = broker.get("companyName", "")
+            company_name = ctx.broker.get("companyName", "")
             if company_name:
                 return f"{company_name} - {mobile_title}"
             return mobile_title
 
         # Old API Format (Fallback)
         # Extract company name
-        company_name = ""
-        provider = property_data.get("provider", {})
-        if provider and isinstance(provider, dict):
-            intermediary_card = provider.get("intermediaryCard", {})
-            if intermediary_card and isinstance(intermediary_card, dict):
-                company_name = intermediary_card.get("title", "")
-        
+        company_name = ctx.intermediary_card.get("title", "")
+
         # Try from hardFacts->title
-        base_title = ""
-        hard_facts = property_data.get("hardFacts", {})
-        if hard_facts and isinstance(hard_facts, dict):
-            base_title = hard_facts.get("title", "")
+        base_title = ctx.hard_facts.get("title", "")
 
         # Alternative: From mainDescription->headline
         if not base_title:
-            main_description = property_data.get("mainDescription", {})
-            if main_description and isinstance(main_description, dict):
-                base_title = main_description.get("headline", "")
+            base_title = _safe_get(ctx.data, "mainDescription", "headline", default="")
 
         # Default fallback
         if not base_title:
-            base_title = property_data.get("title", "Property Listing")
+            base_title = ctx.data.get("title", "Property Listing")
 
         # Combine company name with title
         if company_name:
@@ -182,43 +364,36 @@ class ImmoweltDiscordWebhook:
         else:
             return base_title
     
-    def _extract_price(self, property_data: Dict[str, Any]) -> str:
+    def _extract_price(self, ctx: "_PropertyContext") -> str:
         """Extracts price from property data (supports old and new API formats)."""
         # New Mobile API Format: primaryPrice
-        primary_price = property_data.get("primaryPrice", {})
-        if primary_price and isinstance(primary_price, dict):
+        primary_price = ctx.primary_price
+        if primary_price:
             value = primary_price.get("amountMin") or primary_price.get("value")
             currency = primary_price.get("currency", "€")
             if value:
                 # Format number with thousands separator
-                formatted_value = f"{int(value):,}".replace(",", ".")
-                return f"{formatted_value} {currency}"
+                return f"{_format_thousands(int(float(value)))} {currency}"
         
         # Old API Format (Fallback)
         # Try from hardFacts->price->value
-        hard_facts = property_data.get("hardFacts", {})
-        if hard_facts and isinstance(hard_facts, dict):
-            price_data = hard_facts.get("price", {})
-            if price_data and isinstance(price_data, dict):
-                price_value = price_data.get("value", "")
-                if price_value:
-                    return price_value
+        price_value = _safe_get(ctx.hard_facts, "price", "value")
+        if price_value:
+            return price_value
 
         # Alternative: From price->value
-        price_data = property_data.get("price", {})
-        if isinstance(price_data, dict):
-            value = price_data.get("value")
-            currency = price_data.get("currency", "€")
-            if value:
-                return f"{value} {currency}"
+        value = _safe_get(ctx.data, "price", "value")
+        if value:
+            currency = _safe_get(ctx.data, "price", "currency", default="€")
+            return f"{value} {currency}"
                 
         return ""
     
-    def _extract_address(self, property_data: Dict[str, Any]) -> str:
+    def _extract_address(self, ctx: "_PropertyContext") -> str:
         """Extracts the address from property data (supports old and new API formats)."""
         # New Mobile API Format: place
-        place = property_data.get("place", {})
-        if place and isinstance(place, dict):
+        place = ctx.place
+        if place:
             city = place.get("city", "")
             district = place.get("district", "")
             zip_code = place.get("postcode", "") or place.get("zipCode", "")
@@ -239,8 +414,8 @@ class ImmoweltDiscordWebhook:
         
         # Old API Format (Fallback)
         # Prioritize provider->address
-        provider = property_data.get("provider", {})
-        if provider and isinstance(provider, dict):
+        provider = ctx.provider
+        if provider:
             address_data = provider.get("address", "")
             if address_data:
                 if isinstance(address_data, str):
@@ -263,239 +438,162 @@ class ImmoweltDiscordWebhook:
 
                     address = ", ".join(address_parts)
                     # Add provider information
-                    company = provider.get("intermediaryCard", {}).get("title", "")
+                    company = ctx.intermediary_card.get("title", "")
                     if company:
                         return f"{company}\n{address}"
                     return address
 
         # Alternative: From location->address
-        location = property_data.get("location", {})
-        if location and isinstance(location, dict):
-            address_data = location.get("address", {})
-            if address_data and isinstance(address_data, dict):
-                city = address_data.get("city", "")
-                district = address_data.get("district", "")
-                zip_code = address_data.get("zipCode", "")
-                
-                address_parts = []
-                if district and district != city:
-                    address_parts.append(district)
-                if city:
-                    address_parts.append(city)
-                if zip_code:
-                    address_parts.append(zip_code)
-                    
-                return ", ".join(address_parts)
+        address_data = _safe_get(ctx.data, "location", "address")
+        if address_data and isinstance(address_data, dict):
+            city = address_data.get("city", "")
+            district = address_data.get("district", "")
+            zip_code = address_data.get("zipCode", "")
+
+            address_parts = []
+            if district and district != city:
+                address_parts.append(district)
+            if city:
+                address_parts.append(city)
+            if zip_code:
+                address_parts.append(zip_code)
+
+            return ", ".join(address_parts)
                     
         return ""
     
-    def _extract_room_info(self, property_data: Dict[str, Any]) -> str:
+    def _extract_room_info(self, ctx: "_PropertyContext") -> str:
         """Extracts the number of rooms from property data."""
         # New Mobile API Format: roomsMin/roomsMax
-        rooms_min = property_data.get("roomsMin")
-        rooms_max = property_data.get("roomsMax")
+        rooms_min = ctx.data.get("roomsMin")
+        rooms_max = ctx.data.get("roomsMax")
         if rooms_min is not None:
-            if rooms_max and rooms_max != rooms_min:
-                return f"{rooms_min}-{rooms_max} rooms"
-            else:
-                return f"{rooms_min} rooms"
+            return _range_str(rooms_min, rooms_max, "rooms")
 
         # Try from hardFacts->facts (old API)
-        hard_facts = property_data.get("hardFacts", {})
-        if hard_facts and isinstance(hard_facts, dict):
-            facts = hard_facts.get("facts", [])
-            if facts and isinstance(facts, list):
-                for fact in facts:
-                    if fact.get("type") == "numberOfRooms":
-                        return fact.get("value", "")
+        if "numberOfRooms" in ctx.facts_by_type:
+            return ctx.facts_by_type["numberOfRooms"]
 
         # Alternative: From rawData->nbroom
-        raw_data = property_data.get("rawData", {})
-        if raw_data and isinstance(raw_data, dict):
-            rooms = raw_data.get("nbroom")
-            if rooms:
-                return f"{rooms} rooms"
+        rooms = ctx.raw_data.get("nbroom")
+        if rooms:
+            return f"{rooms} rooms"
 
         # Further alternative
-        return property_data.get("rooms", "")
+        return ctx.data.get("rooms", "")
     
-    def _extract_area_info(self, property_data: Dict[str, Any]) -> str:
+    def _extract_area_info(self, ctx: "_PropertyContext") -> str:
         """Extracts the living area from property data."""
         # New Mobile API Format: primaryArea or areas with LIVING_AREA type
-        primary_area = property_data.get("primaryArea", {})
-        if primary_area and isinstance(primary_area, dict):
-            if primary_area.get("type") == "LIVING_AREA":
-                size_min = primary_area.get("sizeMin")
-                size_max = primary_area.get("sizeMax")
-                if size_min is not None:
-                    if size_max and size_max != size_min:
-                        return f"{size_min}-{size_max} m²"
-                    else:
-                        return f"{size_min} m²"
+        primary_area = ctx.primary_area
+        if primary_area and primary_area.get("type") == "LIVING_AREA":
+            if primary_area.get("sizeMin") is not None:
+                return self._area_str(primary_area)
 
         # Alternative: From areas Array
-        areas = property_data.get("areas", [])
-        if areas and isinstance(areas, list):
-            for area in areas:
-                if area.get("type") == "LIVING_AREA":
-                    size_min = area.get("sizeMin")
-                    size_max = area.get("sizeMax")
-                    if size_min is not None:
-                        if size_max and size_max != size_min:
-                            return f"{size_min}-{size_max} m²"
-                        else:
-                            return f"{size_min} m²"
+        area = ctx.areas_by_type.get("LIVING_AREA")
+        if area:
+            return self._area_str(area)
 
         # Try from hardFacts->facts (old API)
-        hard_facts = property_data.get("hardFacts", {})
-        if hard_facts and isinstance(hard_facts, dict):
-            facts = hard_facts.get("facts", [])
-            if facts and isinstance(facts, list):
-                for fact in facts:
-                    if fact.get("type") == "livingSpace":
-                        return fact.get("value", "")
+        if "livingSpace" in ctx.facts_by_type:
+            return ctx.facts_by_type["livingSpace"]
 
         # Alternative: From rawData->surface->main
-        raw_data = property_data.get("rawData", {})
-        if raw_data and isinstance(raw_data, dict):
-            surface = raw_data.get("surface", {})
-            if surface and isinstance(surface, dict):
-                main_area = surface.get("main")
-                if main_area:
-                    return f"{main_area} m²"
+        main_area = ctx.surface.get("main")
+        if main_area:
+            return f"{main_area} m²"
 
         # Further alternative
-        living_area = property_data.get("livingArea")
+        living_area = ctx.data.get("livingArea")
         if living_area:
             return f"{living_area} m²"
             
         return ""
     
-    def _extract_plot_info(self, property_data: Dict[str, Any]) -> str:
+    def _extract_plot_info(self, ctx: "_PropertyContext") -> str:
         """Extracts the plot area from property data."""
         # New Mobile API Format: areas with PLOT_AREA type
-        areas = property_data.get("areas", [])
-        if areas and isinstance(areas, list):
-            for area in areas:
-                if area.get("type") == "PLOT_AREA":
-                    size_min = area.get("sizeMin")
-                    size_max = area.get("sizeMax")
-                    if size_min is not None:
-                        if size_max and size_max != size_min:
-                            return f"{size_min}-{size_max} m² plot"
-                        else:
-                            return f"{size_min} m² plot"
+        area = ctx.areas_by_type.get("PLOT_AREA")
+        if area:
+            return self._area_str(area)
 
         # Try from hardFacts->facts (old API)
-        hard_facts = property_data.get("hardFacts", {})
-        if hard_facts and isinstance(hard_facts, dict):
-            facts = hard_facts.get("facts", [])
-            if facts and isinstance(facts, list):
-                for fact in facts:
-                    if fact.get("type") == "plotSpace":
-                        return fact.get("value", "")
+        if "plotSpace" in ctx.facts_by_type:
+            return ctx.facts_by_type["plotSpace"]
 
         # Alternative: From rawData->surface->plot
-        raw_data = property_data.get("rawData", {})
-        if raw_data and isinstance(raw_data, dict):
-            surface = raw_data.get("surface", {})
-            if surface and isinstance(surface, dict):
-                plot_area = surface.get("plot")
-                if plot_area:
-                    return f"{plot_area} m²"
+        plot_area = ctx.surface.get("plot")
+        if plot_area:
+            return f"{plot_area} m²"
             
         return ""
     
-    def _extract_image_url(self, property_data: Dict[str, Any]) -> Optional[str]:
+    @staticmethod
+    def _area_str(area: Dict[str, Any]) -> str:
+        """Formats a mobile API area entry with the unit for its type."""
+        return _range_str(area["sizeMin"], area.get("sizeMax"), _AREA_UNITS[area["type"]])
+
+    def _extract_image_url(self, ctx: "_PropertyContext") -> Optional[str]:
         """
         Extracts the URL of the first image from property data (supports old and new API formats).
         """
         try:
+            property_data = ctx.data
+
             # New Mobile API Format: pictures with imageUri
-            pictures = property_data.get("pictures", [])
-            if pictures and isinstance(pictures, list) and len(pictures) > 0:
-                first_picture = pictures[0]
-                if first_picture and isinstance(first_picture, dict):
-                    image_uri = first_picture.get("imageUri")
-                    if image_uri:
-                        return image_uri
-                    # Fallback to url
-                    return first_picture.get("url", "")
+            # (malformed entries fall through to the next source)
+            first_picture = _as_dict(_safe_get(property_data, "pictures", 0))
+            if first_picture:
+                # Fallback to url
+                return first_picture.get("imageUri") or first_picture.get("url", "")
 
             # Old API Format (Fallback)
             # Try to extract the first image from gallery->images
-            gallery = property_data.get("gallery", {})
-            if gallery and isinstance(gallery, dict):
-                images = gallery.get("images", [])
-                if images and isinstance(images, list) and len(images) > 0:
-                    first_image = images[0]
-                    if first_image and isinstance(first_image, dict):
-                        return first_image.get("url", "")
+            first_image = _as_dict(_safe_get(property_data, "gallery", "images", 0))
+            if first_image:
+                return first_image.get("url", "")
 
             # Alternative: Try to extract the first image from media
-            media = property_data.get("media", [])
-            if media and isinstance(media, list):
-                for item in media:
-                    if item.get("type") == "IMAGE" and item.get("url"):
-                        return item.get("url")
+            for item in _as_list(property_data.get("media")):
+                if item.get("type") == "IMAGE" and item.get("url"):
+                    return item.get("url")
 
             # Last alternative: Check for a possible title picture
-            title_picture = property_data.get("titlePicture", {})
-            if title_picture and isinstance(title_picture, dict):
-                return title_picture.get("url", "")
-
-            return None
+            return _safe_get(property_data, "titlePicture", "url")
 
         except Exception as e:
             logger.error(f"Error extracting image URL: {str(e)}")
             return None
     
-    def _extract_logo_url(self, property_data: Dict[str, Any]) -> Optional[str]:
+    def _extract_logo_url(self, ctx: "_PropertyContext") -> Optional[str]:
         """
         Extracts the company logo URL from property data (supports old and new API formats).
         """
         try:
-            # New Mobile API Format: broker->logoUriHttps
-            broker = property_data.get("broker", {})
-            if broker and isinstance(broker, dict):
-                logo_uri_https = broker.get("logoUriHttps", "")
-                if logo_uri_https and logo_uri_https != "https:":
-                    return logo_uri_https
-
-                # Fallback to logoUri
-                logo_uri = broker.get("logoUri", "")
-                if logo_uri and logo_uri != "https:":
-                    # If the URL doesn't start with http, add the protocol
-                    if logo_uri.startswith("//"):
-                        return "https:" + logo_uri
-                    return logo_uri
+            # New Mobile API Format: broker->logoUriHttps, falling back to logoUri
+            # (placeholders such as a bare "https:" are rejected by _normalize_url)
+            broker = ctx.broker
+            if broker:
+                logo_url = _normalize_url(broker.get("logoUriHttps")) or _normalize_url(broker.get("logoUri"))
+                if logo_url:
+                    return logo_url
 
             # Old API Format (Fallback)
             # Try to extract logo from provider->intermediaryCard->logoUrl
-            provider = property_data.get("provider", {})
-            if provider and isinstance(provider, dict):
-                intermediary_card = provider.get("intermediaryCard", {})
-                if intermediary_card and isinstance(intermediary_card, dict):
-                    logo_url = intermediary_card.get("logoUrl", "")
-                    if logo_url:
-                        # If the URL doesn't start with http, add the protocol
-                        if logo_url.startswith("//"):
-                            logo_url = "https:" + logo_url
-                        return logo_url
-
-            return None
+            return _normalize_url(ctx.intermediary_card.get("logoUrl"))
 
         except Exception as e:
             logger.error(f"Error extracting logo URL: {str(e)}")
             return None
     
-    def _extract_provider_info(self, property_data: Dict[str, Any]) -> str:
+    def _extract_provider_info(self, ctx: "_PropertyContext") -> str:
         """Extracts provider information from property data (supports old and new API formats)."""
         # New Mobile API Format: broker
-        broker = property_data.get("broker", {})
-        if broker and isinstance(broker, dict):
+        broker = ctx.broker
+        if broker:
             company = broker.get("companyName", "")
-            online_id = property_data.get("onlineId", "")
+            online_id = ctx.data.get("onlineId", "")
             
             info_parts = []
             if company:
@@ -506,13 +604,10 @@ class ImmoweltDiscordWebhook:
             return "\n".join(info_parts)
 
         # Old API Format (Fallback)
-        provider = property_data.get("provider", {})
-        if provider and isinstance(provider, dict):
+        provider = ctx.provider
+        if provider:
             # Company name
-            company = ""
-            intermediary_card = provider.get("intermediaryCard", {})
-            if intermediary_card and isinstance(intermediary_card, dict):
-                company = intermediary_card.get("title", "")
+            company = ctx.intermediary_card.get("title", "")
 
             # Phone numbers
             phone_numbers = provider.get("phoneNumbers", [])
@@ -538,6 +633,19 @@ class ImmoweltDiscordWebhook:
         """
         Sends multiple property listings to the Discord webhook.
 
+        Args:
+            properties (List[Dict[str, Any]]): List of property data
+
+        Returns:
+            int: Number of successfully sent listings
+        """
+        return asyncio.run(self.send_properties_async(properties))
+
+    async def send_properties_async(self, properties: List[Dict[str, Any]]) -> int:
+        """
+        Sends multiple property listings to the Discord webhook concurrently
+        over a single shared HTTP session.
+
         Args:
             properties (List[Dict[str, Any]]): List of property data
 
@@ -548,15 +656,119 @@ class ImmoweltDiscordWebhook:
             logger.warning("No properties provided to send.")
             return 0
 
-        success_count = 0
+        if not self.webhook_url:
+            logger.error("Discord webhook URL not configured.")
+            return 0
+
+        # One timestamp for the whole batch
+        timestamp = _utcnow_iso()
 
+        # Listings are drained from a queue by a few workers rather than all
+        # posted at once, which would only run into Discord's per-webhook bucket
+        queue = asyncio.Queue()
         for prop in properties:
-            if self.send_property(prop):
-                success_count += 1
+            queue.put_nowait(prop)
+        workers = min(self.MAX_WORKERS, len(properties))
+
+        async with AsyncSession(max_clients=workers) as session:
+            results = await asyncio.gather(
+                *(self._send_worker(queue, session, timestamp) for _ in range(workers))
+            )
 
+        success_count = sum(results)
         logger.info(f"{success_count} of {len(properties)} properties successfully sent to Discord.")
         return success_count
 
+    async def _send_worker(self, queue: asyncio.Queue, session: AsyncSession, timestamp: str) -> int:
+        """
+        Sends queued property listings one at a time until the queue is empty.
+
+        Args:
+            queue (asyncio.Queue): Listings still to be sent
+            session (AsyncSession): Shared HTTP session
+            timestamp (str): ISO timestamp for the embeds of this batch
+
+        Returns:
+            int: Number of listings this worker sent successfully
+        """
+        sent = 0
+        while True:
+            try:
+                property_data = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return sent
+            if await self._send_property_async(session, property_data, timestamp):
+                sent += 1
+
+    async def _wait_for_bucket(self):
+        """Waits until Discord's rate limit bucket for the webhook has room, then reserves a request."""
+        while self._bucket_remaining == 0:
+            delay = self._bucket_reset_at - time.monotonic()
+            if delay <= 0:
+                # Bucket has reset; its new size is learned from the next response
+                self._bucket_remaining = None
+                break
+            await asyncio.sleep(delay)
+        if self._bucket_remaining:
+            self._bucket_remaining -= 1
+        self._in_flight += 1
+
+    def _update_bucket(self, response) -> None:
+        """Updates the rate limit bucket from the X-RateLimit/Retry-After headers of a response."""
+        headers = response.headers
+        if response.status_code == 429:
+            self._bucket_remaining = 0
+            self._bucket_reset_at = time.monotonic() + float(headers.get("Retry-After", 1))
+        elif "X-RateLimit-Remaining" in headers:
+            # Requests still in flight are not counted by Discord yet
+            self._bucket_remaining = max(0, int(headers["X-RateLimit-Remaining"]) - self._in_flight)
+            self._bucket_reset_at = time.monotonic() + float(headers.get("X-RateLimit-Reset-After", 0))
+
+    async def _send_property_async(self, session: AsyncSession, property_data: Dict[str, Any], timestamp: Optional[str] = None) -> bool:
+        """
+        Posts a single property listing through the given session.
+
+        Args:
+            session (AsyncSession): Shared HTTP session
+            property_data (Dict[str, Any]): Property data with at least URL, title, and address
+            timestamp (str, optional): ISO timestamp for the embed, shared across a batch
+
+        Returns:
+            bool: True if sending was successful, otherwise False
+        """
+        try:
+            payload = self._build_payload(property_data, timestamp)
+            if payload is None:
+                logger.info("Skipping empty listing")
+                return False
+            title = payload["embeds"][0].get("title", "")
+            # Serialized once, reused if the post is retried
+            body = orjson.dumps(payload)
+
+            # Honor Discord's rate limit and retry once the bucket resets;
+            # the reset time is shared, so all workers pause together
+            while True:
+                await self._wait_for_bucket()
+                try:
+                    response = await session.post(self.webhook_url, data=body, headers=JSON_HEADERS, timeout=10)
+                finally:
+                    self._in_flight -= 1
+                self._update_bucket(response)
+                if response.status_code != 429:
+                    break
+                logger.warning(f"Discord rate limit hit, retrying in {response.headers.get('Retry-After', 1)} seconds")
+
+            if response.status_code in [200, 204]:
+                logger.info(f"Property listing successfully sent to Discord: {title}")
+                return True
+            else:
+                logger.error(f"Error sending to Discord: {response.status_code} - {response.text}")
+                return False
+
+        except Exception as e:
+            logger.error(f"Error sending property listing to Discord: {str(e)}")
+            return False
+
 def format_property_for_discord(property_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Formats property data for the Discord webhook.
@@ -570,10 +782,34 @@ def format_property_for_discord(property_data: Dict[str, Any]) -> Dict[str, Any]
     # Simply return the original object, as we now do the extraction in the class methods
     return property_data
 
+def intern_strings(data: Any, max_length: int = 32) -> Any:
+    """
+    Rebuilds decoded JSON with dict keys and short string values interned,
+    so strings repeated across listings (keys, types like "LIVING_AREA",
+    currencies) are stored once and compare by identity.
+
+    Args:
+        data (Any): Decoded JSON data
+        max_length (int): Longest string value to intern
+
+    Returns:
+        Any: The data with interned strings
+    """
+    intern = sys.intern
+    if isinstance(data, dict):
+        return {
+            intern(key) if isinstance(key, str) else key: intern_strings(value, max_length)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [intern_strings(item, max_length) for item in data]
+    if isinstance(data, str) and len(data) <= max_length:
+        return intern(data)
+    return data
+
 # Example usage code
 if __name__ == "__main__":
     # Webhook URL from environment variable or specify directly
-    import sys, json
     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from config import DISCORD_WEBHOOK_URL
     webhook_url = DISCORD_WEBHOOK_URL
@@ -629,7 +865,7 @@ if __name__ == "__main__":
     print("Starting Discord webhook")
     print("Sending webhook to: ", webhook_url)
     with open("data/details.json", "r") as f:
-        property_example = json.load(f)
+        property_example = intern_strings(orjson.loads(f.read()))
 
     if isinstance(property_example, list):
         properties = property_example
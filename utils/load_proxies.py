@@ -1,59 +1,92 @@
-import requests, os
+import requests, os, math, functools
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 load_dotenv()
 
 API_KEY_WEBSHARE = os.getenv('API_KEY_WEBSHARE', '')
 USE_WEBSHARE = os.getenv('USE_WEBSHARE', 'False').lower() == 'true'
 
-def fetch_proxies(api_url, token):
+def _build_session():
+    # Bounded retries with exponential backoff over one pooled connection,
+    # instead of reconnecting in a tight loop while the API is flapping
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )))
+    return session
+
+def fetch_proxies(api_url, token, page_size=100):
     headers = {
         "Authorization": f"Token {token}"
     }
 
     proxies = []
     try:
-        while True:
-            try:
-                response = requests.get(api_url, headers=headers, timeout=(5,5))
-                if response.status_code == 200:break
-            except:
-                pass
-        if response.status_code == 200:
-            data = response.json()
-            for result in data.get("results", []):
-                ip = result["proxy_address"]
-                port = result["port"]
-                username = result["username"]
-                password = result["password"]
-                # Create IP:Port format
-                proxies.append(f"{ip}:{port}:{username}:{password}")
-        else:
-            print(f"Error fetching proxy data: {response.status_code}")
+        with _build_session() as session:
+            def fetch_page(page):
+                return session.get(f"{api_url}&page={page}&page_size={page_size}", headers=headers, timeout=(5,10))
+
+            def fetch_page_results(page):
+                # A failing page is skipped instead of discarding the other pages
+                try:
+                    page_response = fetch_page(page)
+                    if page_response.status_code == 200:
+                        return page_response.json().get("results", [])
+                    print(f"Error fetching proxy data (page {page}): {page_response.status_code}")
+                except Exception as e:
+                    print(f"Error fetching proxy data (page {page}): {e}")
+                return None
+
+            # The first page tells how many proxies there are in total
+            response = fetch_page(1)
+            if response.status_code == 200:
+                data = response.json()
+                results = list(data.get("results", []))
+                pages = math.ceil(data.get("count", 0) / page_size)
+                if pages > 1:
+                    # Fetch the remaining pages concurrently over the shared session
+                    with ThreadPoolExecutor(max_workers=min(10, pages - 1)) as executor:
+                        for page_results in executor.map(fetch_page_results, range(2, pages + 1)):
+                            if page_results:
+                                results.extend(page_results)
+                for result in results:
+                    ip = result["proxy_address"]
+                    port = result["port"]
+                    username = result["username"]
+                    password = result["password"]
+                    # Create IP:Port format
+                    proxies.append(f"{ip}:{port}:{username}:{password}")
+            else:
+                print(f"Error fetching proxy data: {response.status_code}")
     except Exception as e:
         print(f"Error fetching proxy data: {e}")
 
-    return [{}] if proxies == [] else proxies
+    # Empty on failure; load_proxies then falls back to a direct connection
+    return proxies
 
 def load_proxies_all(proxies):
     proxies_list = []
     for proxy in proxies:
-        proxy_data = proxy.strip().split(':')
-        if len(proxy_data) >= 2:
-            ip = proxy_data[0]
-            port = proxy_data[1]
-            username = proxy_data[2]
-            password = proxy_data[3]
+        # ip:port:username:password; anything after the fourth ':' stays part of the password
+        proxy_data = proxy.strip().split(':', 3)
+        if len(proxy_data) == 4:
+            ip, port, username, password = proxy_data
             proxy = {
                 'https': f'http://{username}:{password}@{ip}:{port}'
             }
             proxies_list.append(proxy)
-    
+
     return proxies_list
 
 def load_proxies():
     if USE_WEBSHARE:
-        api_url = "https://proxy.webshare.io/api/v2/proxy/list/?mode=direct&page=1&page_size=100"
+        api_url = "https://proxy.webshare.io/api/v2/proxy/list/?mode=direct"
         proxies = fetch_proxies(api_url, API_KEY_WEBSHARE)
         # Convert proxy data to correct format
         loaded_proxies = load_proxies_all(proxies)
@@ -65,20 +98,9 @@ def load_proxies():
         # Ensure path is relative to script location
         script_dir = os.path.dirname(os.path.abspath(__file__))  # Current script folder
         file_path = os.path.join(script_dir, filename)
-        proxies_list = []
         try:
             with open(file_path, 'r') as file:
-                for line in file:
-                    proxy_data = line.strip().split(':')
-                    if len(proxy_data) >= 2:
-                        ip = proxy_data[0]
-                        port = proxy_data[1]
-                        username = proxy_data[2]
-                        password = proxy_data[3]
-                        proxy = {
-                            'https': f'http://{username}:{password}@{ip}:{port}'
-                        }
-                        proxies_list.append(proxy)
+                proxies_list = load_proxies_all(file.read().splitlines())
         except FileNotFoundError:
             print(f"File {file_path} not found.")
             return [{}]
@@ -87,8 +109,11 @@ def load_proxies():
             return [{}]
         print(f"Loaded proxies: {len(proxies_list)} with file")
         return proxies_list if proxies_list else [{}]
-    
-proxies = load_proxies()
+
+@functools.lru_cache(maxsize=1)
+def get_proxies():
+    # Loaded on first use and memoized, so importing this module does no I/O
+    return load_proxies()
 
 if __name__ == '__main__':
     loaded_proxies = load_proxies()
@@ -1,6 +1,282 @@
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
-from typing import Optional
+import pathlib
+import queue
+import signal
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from typing import Dict, Optional, Union
+
+# None of the handlers use thread, process or task info, so skip collecting it per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False
+
+
+class FastFormatter(logging.Formatter):
+    """
+    Formatter for the fixed '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    layout, built with one f-string. The strftime result is reused for all
+    records within the same second.
+    """
+
+    def __init__(self):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        # (second, formatted) replaced as a whole, safe to share between listener threads
+        self._second = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, formatted = self._second
+        if second != cached_second:
+            formatted = time.strftime("%Y-%m-%d %H:%M:%S", self.converter(second))
+            self._second = (second, formatted)
+        return f"{formatted},{int(record.msecs):03d}"
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record.exc_info or record.exc_text or record.stack_info:
+            # Rare: let the generic path append tracebacks
+            return super().format(record)
+        return f"{self.formatTime(record)} - {record.name} - {record.levelname} - {record.getMessage()}"
+
+
+# Shared by all handlers of all loggers
+_FORMATTER = FastFormatter()
+
+# Ensure the "logs" folder exists
+_LOG_DIR = pathlib.Path(__file__).resolve().parent.parent / "logs"
+
+# Set once the "logs" folder has been created by the background thread
+_DIR_READY = threading.Event()
+
+
+def _prewarm() -> None:
+    # Runs while the rest of the application is still being imported
+    try:
+        _LOG_DIR.mkdir(exist_ok=True)
+    except OSError:
+        # Surfaces when the log file is opened
+        pass
+    finally:
+        _DIR_READY.set()
+
+
+threading.Thread(target=_prewarm, name="log-dir-prewarm", daemon=True).start()
+
+# Fully configured loggers by name
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
+
+# Buffered file handler chain per log file path, shared by all loggers
+# writing to the same file so they use one file descriptor
+_HANDLER_BY_PATH: Dict[str, logging.Handler] = {}
+
+# Queue listeners per logger name; they own the real handlers and write
+# records on their own thread
+_LISTENERS: Dict[str, logging.handlers.QueueListener] = {}
+
+
+def _shutdown_listeners() -> None:
+    # Drain every queue, then the buffers, before the interpreter exits
+    for listener in _LISTENERS.values():
+        listener.stop()
+    for listener in _LISTENERS.values():
+        for handler in listener.handlers:
+            handler.flush()
+
+
+atexit.register(_shutdown_listeners)
+
+
+class PeriodicFlushingMemoryHandler(logging.handlers.MemoryHandler):
+    """
+    MemoryHandler that is also flushed by a background timer every `period`
+    seconds while it holds records, so the file lags at most `period`
+    seconds behind, even after a logger goes quiet.
+    """
+
+    def __init__(self, capacity: int, flushLevel: int = logging.ERROR, target: Optional[logging.Handler] = None,
+                 flushOnClose: bool = True, period: float = 5.0):
+        super().__init__(capacity, flushLevel=flushLevel, target=target, flushOnClose=flushOnClose)
+        self.period = period
+        self._closed = threading.Event()
+        threading.Thread(target=self._flush_periodically, name="log-flush", daemon=True).start()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed.wait(self.period):
+            if self.buffer:
+                self.flush()
+
+    def flush(self) -> None:
+        super().flush()
+        # Push the batch through to the file in one go
+        with self.lock:
+            if self.target:
+                self.target.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        super().close()
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Size-rotated log file written through a large, block-aligned buffer.
+    Unlike FileHandler it does not flush after every record; the buffer
+    is written out when full or when flush() is called. The file is only
+    opened once the first record arrives (unless delay=False). Records are encoded here and
+    written to the binary stream, without a TextIOWrapper in between.
+    """
+
+    def __init__(self, filename: Union[str, os.PathLike], maxBytes: int = 8 * 1024 * 1024, backupCount: int = 5,
+                 encoding: str = "utf-8", delay: bool = True):
+        # Bytes in the current file, tracked here because seek()/tell() on
+        # the buffered stream (as RotatingFileHandler does) would flush it;
+        # set before super().__init__, which calls _open() when delay=False
+        self._size = 0
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=delay)
+
+    @staticmethod
+    def _buffer_size(folder: str) -> int:
+        """Returns a buffer size of at least 64 KiB that is a multiple of the filesystem block size."""
+        try:
+            block_size = os.statvfs(folder).f_bsize
+        except (AttributeError, OSError):
+            # No statvfs (Windows) or not queryable
+            block_size = 4096
+        return max(1, (1 << 16) // block_size) * block_size
+
+    def _open(self):
+        # Append mode opens with O_APPEND (and O_CLOEXEC, as all Python files)
+        stream = open(self.baseFilename, "ab", buffering=self._buffer_size(os.path.dirname(self.baseFilename)))
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding, self.errors or "backslashreplace")
+            if self.stream is None:
+                self.stream = self._open()
+            # Like shouldRollover (gh-116263), never rotate out an empty file
+            if self.maxBytes > 0 and self._size and self._size + len(data) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(data)
+            self._size += len(data)
+        except Exception:
+            self.handleError(record)
+
+
+class BatchedStreamHandler(logging.StreamHandler):
+    """
+    Stream handler for a buffered stream that flushes only once the log
+    queue feeding it is empty, so a burst of records costs one write.
+    """
+
+    def __init__(self, stream, log_queue: queue.Queue):
+        super().__init__(stream)
+        self._queue = log_queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if self._queue.empty():
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def _console_handler(log_queue: queue.Queue) -> Optional[logging.Handler]:
+    """
+    Returns the console handler, or None if disabled with LOG_CONSOLE=0.
+    On a terminal stderr stays line-buffered; otherwise (docker, systemd,
+    nohup) records are written through a block-buffered stream.
+    """
+    if os.getenv('LOG_CONSOLE', '1') == '0':
+        return None
+    try:
+        if not sys.stderr.isatty():
+            # closefd=False: closing this wrapper must not close stderr
+            stream = open(sys.stderr.fileno(), "w", encoding=sys.stderr.encoding,
+                          errors="backslashreplace", closefd=False)
+            return BatchedStreamHandler(stream, log_queue)
+    except (AttributeError, OSError, ValueError):
+        # stderr replaced by an object without a real file descriptor
+        pass
+    return logging.StreamHandler()
+
+
+class SlimLogRecord(logging.LogRecord):
+    """
+    LogRecord that only sets the fields the handlers here use; source,
+    thread, process and task fields are class-level placeholders.
+    """
+
+    pathname = filename = "(unknown file)"
+    module = "(unknown module)"
+    lineno = 0
+    funcName = "(unknown function)"
+    relativeCreated = 0.0
+    thread = threadName = None
+    process = processName = None
+    taskName = None
+
+    def __init__(self, name: str, level: int, msg, args, exc_info, sinfo: Optional[str] = None):
+        created_ns = time.time_ns()
+        self.name = name
+        self.msg = msg
+        # Same single-mapping unwrapping as LogRecord, for '%(key)s' messages
+        if args and len(args) == 1 and isinstance(args[0], Mapping) and args[0]:
+            args = args[0]
+        self.args = args
+        self.levelname = logging.getLevelName(level)
+        self.levelno = level
+        self.exc_info = exc_info
+        self.exc_text = None
+        self.stack_info = sinfo
+        self.created = created_ns / 1e9
+        self.msecs = (created_ns % 1_000_000_000) // 1_000_000 + 0.0
+
+
+def _make_slim_record(name, level, fn, lno, msg, args, exc_info, func=None, extra=None, sinfo=None):
+    # Replaces Logger.makeRecord for configured loggers
+    record = SlimLogRecord(name, level, msg, args, exc_info, sinfo)
+    if extra is not None:
+        for key in extra:
+            if key in ("message", "asctime") or key in record.__dict__:
+                raise KeyError(f"Attempt to overwrite {key!r} in LogRecord")
+            setattr(record, key, extra[key])
+    return record
+
+
+def _skip_find_caller(logger: logging.Logger, stack_info: bool = False, stacklevel: int = 1):
+    # The log format has no file, line or function name, so the caller's
+    # frame is only looked up when a stack was asked for
+    if stack_info:
+        # +1 skips this wrapper's own frame
+        return logging.Logger.findCaller(logger, stack_info, stacklevel + 1)
+    return "(unknown file)", 0, "(unknown function)", None
+
+
+def _exit_on_sigterm(signum, frame):
+    # Turn SIGTERM (e.g. `docker stop`) into a normal exit so atexit
+    # hooks flush the buffered log files
+    sys.exit(128 + signum)
+
+
+def _install_sigterm_handler() -> None:
+    """Installs _exit_on_sigterm unless the application set its own SIGTERM handler."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
 
 def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
     """
@@ -14,38 +290,63 @@ def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
     Returns:
         logging.Logger: Configured logger
     """
-    # Ensure the "logs" folder exists
-    log_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-    os.makedirs(log_folder, exist_ok=True)
+    cached = _LOGGER_CACHE.get(name)
+    if cached is not None:
+        return cached
 
     # Create logger with the given name
     logger = logging.getLogger(name)
 
     # If logger already has handlers, return it
     if logger.handlers:
+        _LOGGER_CACHE[name] = logger
         return logger
 
-    logger.setLevel(logging.INFO)
-
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # LOG_LEVEL applies to all loggers; unknown names fall back to INFO
+    level = logging.getLevelNamesMapping().get(os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
+    logger.setLevel(level)
+    logger.findCaller = functools.partial(_skip_find_caller, logger)
+    logger.makeRecord = _make_slim_record
 
     # File Handler
     if log_file is None:
         log_file = f"{name.lower()}_monitor.log"
-    fh = logging.FileHandler(
-        os.path.join(log_folder, log_file),
-        encoding="utf-8"
-    )
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    log_path = str(_LOG_DIR / log_file)
+    mh = _HANDLER_BY_PATH.get(log_path)
+    if mh is None:
+        _DIR_READY.wait()
+        fh = BufferedRotatingFileHandler(
+            log_path,
+            maxBytes=8 * 1024 * 1024,
+            backupCount=5,
+            encoding="utf-8",
+            delay=True
+        )
+        fh.setFormatter(_FORMATTER)
+        # Buffer file records and write them in batches
+        mh = PeriodicFlushingMemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=fh, flushOnClose=True)
+        _HANDLER_BY_PATH[log_path] = mh
+
+    # The logger only enqueues records; a listener thread does the writes.
+    # File output there is batched into block-sized write() calls, so the
+    # write path has no per-record syscall left to hand off (e.g. to io_uring)
+    log_queue = queue.Queue(-1)
+    handlers = [mh]
 
     # Console Handler
-    ch = logging.StreamHandler()
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    ch = _console_handler(log_queue)
+    if ch is not None:
+        ch.setFormatter(_FORMATTER)
+        handlers.append(ch)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _LISTENERS[name] = listener
+    _install_sigterm_handler()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
     # Prevent propagation to root logger
     logger.propagate = False
 
+    _LOGGER_CACHE[name] = logger
     return logger
\ No newline at end of file